@@ -1,47 +1,89 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-import glob
-import json
 import os
+import sys
 
-from pathlib import Path
+from contextvars import ContextVar
 from typing import Any
 
 import yaml
 
+from msgspec import json
+
 from backend.core.conf import settings
 from backend.core.path_conf import LOCALE_DIR
 
+# 默认语言，启动后不会变化，避免热路径上重复访问配置对象
+_DEFAULT_LANG = settings.I18N_DEFAULT_LANGUAGE
+
+# 优先使用基于 libyaml 的 C 加载器
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# 当前请求的语言，由国际化中间件按请求设置
+current_language_context: ContextVar[str] = ContextVar('current_language', default=_DEFAULT_LANG)
+
 
 class I18n:
     """国际化管理器"""
 
+    __slots__ = ('locales', '_flat')
+
     def __init__(self):
         self.locales: dict[str, dict[str, Any]] = {}
-        self.current_language: str = settings.I18N_DEFAULT_LANGUAGE
+        self._flat: dict[str, dict[str, str]] = {}
+
+    @property
+    def current_language(self) -> str:
+        """当前请求的语言"""
+        return current_language_context.get()
 
     def load_locales(self):
         """加载语言文本"""
-        patterns = [
-            os.path.join(LOCALE_DIR, '*.json'),
-            os.path.join(LOCALE_DIR, '*.yaml'),
-            os.path.join(LOCALE_DIR, '*.yml'),
-        ]
-
-        lang_files = []
-
-        for pattern in patterns:
-            lang_files.extend(glob.glob(pattern))
-
-        for lang_file in lang_files:
-            with open(lang_file, 'r', encoding='utf-8') as f:
-                lang = Path(lang_file).stem
-                file_type = Path(lang_file).suffix[1:]
-                match file_type:
-                    case 'json':
-                        self.locales[lang] = json.loads(f.read())
-                    case 'yaml' | 'yml':
-                        self.locales[lang] = yaml.full_load(f.read())
+        with os.scandir(LOCALE_DIR) as entries:
+            for entry in entries:
+                lang, _, file_type = entry.name.rpartition('.')
+                # 与 glob 一致，跳过隐藏文件（例如 macOS 的 ._en-US.json）
+                if entry.name.startswith('.') or file_type not in ('json', 'yaml', 'yml') or not entry.is_file():
+                    continue
+                with open(entry.path, 'rb') as f:
+                    match file_type:
+                        case 'json':
+                            self.locales[lang] = json.decode(f.read())
+                        case 'yaml' | 'yml':
+                            self.locales[lang] = yaml.load(f, Loader=_YamlLoader)
+
+        # 驻留语言代码和文本键，字典查找时可直接按引用比较
+        # 空文件或非映射内容视为无文本
+        flat = {
+            sys.intern(lang): self._flatten(translations) if isinstance(translations, dict) else {}
+            for lang, translations in self.locales.items()
+        }
+
+        # 合并默认语言文本作为回退，缺失的文本键无需再次查找默认语言
+        # Pydantic 文本不参与回退，缺失时保留 Pydantic 自身的错误信息
+        default = {k: v for k, v in flat.get(_DEFAULT_LANG, {}).items() if not k.startswith('pydantic.')}
+        self._flat = {lang: {**default, **translations} for lang, translations in flat.items()}
+
+    @staticmethod
+    def _flatten(translations: dict[str, Any], prefix: str = '') -> dict[str, str]:
+        """
+        将嵌套的语言文本展平为点分隔键的单层字典
+
+        :param translations: 嵌套的语言文本
+        :param prefix: 当前层级的键前缀
+        :return:
+        """
+        flat = {}
+        for k, v in translations.items():
+            path = f'{prefix}{k}'
+            if isinstance(v, dict):
+                flat.update(I18n._flatten(v, f'{path}.'))
+            elif isinstance(v, str):
+                flat[sys.intern(path)] = v
+        return flat
 
     def t(self, key: str, default: Any | None = None, **kwargs) -> str:
         """
@@ -52,26 +94,14 @@ class I18n:
         :param kwargs: 目标文本中的变量参数
         :return:
         """
-        keys = key.split('.')
-
-        try:
-            translation = self.locales[self.current_language]
-        except KeyError:
-            keys = 'error.language_not_found'
-            translation = self.locales[settings.I18N_DEFAULT_LANGUAGE]
-
-        for k in keys:
-            if isinstance(translation, dict) and k in list(translation.keys()):
-                translation = translation[k]
-            else:
-                # Pydantic 兼容
-                if keys[0] == 'pydantic':
-                    translation = None
-                else:
-                    translation = key
+        translations = self._flat.get(current_language_context.get())
+        translation = translations.get(key) if translations is not None else None
+        if translation is None:
+            # Pydantic 兼容
+            translation = None if key.startswith('pydantic.') else key
 
         if translation and kwargs:
-            translation = translation.format(**kwargs)
+            translation = translation.format_map(kwargs)
 
         return translation or default
 
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import json
+
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from backend.common import i18n as i18n_module
+from backend.common.i18n import I18n, current_language_context
+
+
+@pytest.fixture
+def i18n(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> I18n:
+    (tmp_path / 'zh-CN.yml').write_text(
+        'response:\n  success: 请求成功\n'
+        'only_default: 仅默认语言\n'
+        'greeting: 你好 {name}\n'
+        'pydantic:\n  missing: 字段为必填项\n',
+        encoding='utf-8',
+    )
+    (tmp_path / 'en-US.json').write_text(
+        json.dumps({'response': {'success': 'Request success'}, 'greeting': 'Hello {name}'}), encoding='utf-8'
+    )
+    (tmp_path / 'empty.yml').write_text('', encoding='utf-8')
+    (tmp_path / '._en-US.json').write_bytes(b'\x00\x05\x16\x07')
+    (tmp_path / '.json').write_text('{}', encoding='utf-8')
+    monkeypatch.setattr(i18n_module, 'LOCALE_DIR', tmp_path)
+    monkeypatch.setattr(i18n_module, '_DEFAULT_LANG', 'zh-CN')
+
+    instance = I18n()
+    instance.load_locales()
+    return instance
+
+
+@pytest.fixture
+def language(request: pytest.FixtureRequest) -> Generator[str, None, None]:
+    token = current_language_context.set(request.param)
+    yield request.param
+    current_language_context.reset(token)
+
+
+def test_hidden_files_are_skipped(i18n: I18n) -> None:
+    assert sorted(i18n.locales) == ['empty', 'en-US', 'zh-CN']
+
+
+@pytest.mark.parametrize('language', ['zh-CN'], indirect=True)
+def test_nested_key(i18n: I18n, language: str) -> None:
+    assert i18n.t('response.success') == '请求成功'
+    assert i18n.t('pydantic.missing') == '字段为必填项'
+
+
+@pytest.mark.parametrize('language', ['en-US'], indirect=True)
+def test_nested_key_in_other_language(i18n: I18n, language: str) -> None:
+    assert i18n.t('response.success') == 'Request success'
+    assert i18n.t('only_default') == '仅默认语言'
+
+
+@pytest.mark.parametrize('language', ['zh-CN', 'en-US'], indirect=True)
+def test_missing_key(i18n: I18n, language: str) -> None:
+    assert i18n.t('no.such.key') == 'no.such.key'
+    assert i18n.t('no.such.key', default='default') == 'no.such.key'
+
+
+@pytest.mark.parametrize('language', ['en-US'], indirect=True)
+def test_missing_pydantic_key_does_not_fall_back(i18n: I18n, language: str) -> None:
+    assert i18n.t('pydantic.missing') is None
+    assert i18n.t('pydantic.missing', default='default') == 'default'
+
+
+@pytest.mark.parametrize('language', ['de-DE'], indirect=True)
+def test_language_without_locale_file(i18n: I18n, language: str) -> None:
+    assert i18n.t('response.success') == 'response.success'
+    assert i18n.t('pydantic.missing') is None
+
+
+@pytest.mark.parametrize('language', ['empty'], indirect=True)
+def test_empty_locale_file(i18n: I18n, language: str) -> None:
+    assert i18n.locales['empty'] is None
+    assert i18n.t('response.success') == '请求成功'
+    assert i18n.t('pydantic.missing') is None
+
+
+@pytest.mark.parametrize(
+    ['language', 'expected'], (['zh-CN', '你好 fba'], ['en-US', 'Hello fba']), indirect=['language']
+)
+def test_format_kwargs(i18n: I18n, language: str, expected: str) -> None:
+    assert i18n.t('greeting', name='fba') == expected
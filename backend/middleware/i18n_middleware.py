@@ -1,57 +1,118 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+import re
+import sys
+
 from functools import lru_cache
-from typing import Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.common.i18n import current_language_context, i18n
+
+# Accept-Language 语言项，例如 'zh-CN'、'es-419' 或 'en;q=0.8'
+_ACCEPT_LANGUAGE_RE = re.compile(r'(?:^|,)\s*([a-zA-Z0-9-]+)\s*(?:;\s*q\s*=\s*([01](?:\.[0-9]{0,3})?))?')
 
-from backend.common.i18n import i18n
+# 语言映射
+_LANG_MAPPING = {
+    'zh': 'zh-CN',
+    'zh-cn': 'zh-CN',
+    'zh-hans': 'zh-CN',
+    'en': 'en-US',
+    'en-us': 'en-US',
+}
 
 
-class I18nMiddleware(BaseHTTPMiddleware):
+class I18nMiddleware:
     """国际化中间件"""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
         """
-        处理请求并设置国际化语言
+        初始化国际化中间件
 
-        :param request: FastAPI 请求对象
-        :param call_next: 下一个中间件或路由处理函数
+        :param app: ASGI 应用
         :return:
         """
-        language = self.get_current_language(request)
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        处理请求并设置国际化语言
 
-        # 设置国际化语言
-        if language and i18n.current_language != language:
-            i18n.current_language = language
+        :param scope: ASGI 请求范围
+        :param receive: ASGI 接收函数
+        :param send: ASGI 发送函数
+        :return:
+        """
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
 
-        response = await call_next(request)
+        language = self.get_current_language(scope)
+        if not language:
+            await self.app(scope, receive, send)
+            return
 
-        return response
+        # 设置国际化语言，请求结束后还原，避免泄漏到其他请求
+        token = current_language_context.set(language)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_language_context.reset(token)
 
-    @lru_cache(maxsize=128)
-    def get_current_language(self, request: Request) -> str | None:
+    @staticmethod
+    def get_current_language(scope: Scope) -> str | None:
         """
         获取当前请求的语言偏好
 
-        :param request: FastAPI 请求对象
+        :param scope: ASGI 请求范围
         :return:
         """
-        accept_language = request.headers.get('Accept-Language', '')
-        if not accept_language:
-            return None
-
-        languages = [lang.split(';')[0] for lang in accept_language.split(',')]
-        lang = languages[0].lower().strip()
-
-        # 语言映射
-        lang_mapping = {
-            'zh': 'zh-CN',
-            'zh-cn': 'zh-CN',
-            'zh-hans': 'zh-CN',
-            'en': 'en-US',
-            'en-us': 'en-US',
-        }
-
-        return lang_mapping.get(lang, lang)
+        for name, value in scope['headers']:
+            if name == b'accept-language':
+                return _parse_accept_language(value.decode('latin-1')) if value else None
+        return None
+
+
+def _parse_accept_language(accept_language: str) -> str | None:
+    """
+    解析 Accept-Language 请求头，返回权重最高且已加载的语言包名称，均未加载（包括 '*'）时返回 None
+
+    :param accept_language: Accept-Language 请求头
+    :return:
+    """
+    # 已加载的语言包可能随 load_locales 变化，因此不参与缓存，每次请求时检查
+    for lang in _accept_language_tags(accept_language):
+        if lang in i18n.locales:
+            return lang
+    return None
+
+
+@lru_cache(maxsize=256)
+def _accept_language_tags(accept_language: str) -> tuple[str, ...]:
+    """
+    将 Accept-Language 请求头解析为按权重从高到低排列的语言包名称
+
+    结果只取决于请求头本身，客户端通常重复发送相同的值，因此按原始值缓存
+
+    :param accept_language: Accept-Language 请求头
+    :return:
+    """
+    # 单一语言，无需解析权重
+    if ',' not in accept_language and ';' not in accept_language:
+        return (_map_language(accept_language),)
+
+    # 权重相同时保持请求头中的顺序，权重为 0 表示不接受
+    languages = [(lang, float(q) if q else 1.0) for lang, q in _ACCEPT_LANGUAGE_RE.findall(accept_language)]
+    languages.sort(key=lambda item: item[1], reverse=True)
+    return tuple(_map_language(lang) for lang, q in languages if q > 0)
+
+
+def _map_language(lang: str) -> str:
+    """
+    将语言标签映射为语言包名称
+
+    :param lang: 语言标签
+    :return:
+    """
+    lang = lang.lower().strip()
+    return sys.intern(_LANG_MAPPING.get(lang, lang))
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from starlette.types import Receive, Scope, Send
+
+from backend.common.i18n import current_language_context, i18n
+from backend.core.conf import settings
+from backend.middleware.i18n_middleware import I18nMiddleware, _parse_accept_language
+
+
+@pytest.mark.parametrize(
+    ['accept_language', 'expected'],
+    (
+        ['zh-CN', 'zh-CN'],
+        ['en', 'en-US'],
+        [' EN-us ', 'en-US'],
+        ['en;q=0.1,zh;q=0.9', 'zh-CN'],
+        ['zh-CN,zh;q=0.9,en;q=0.8', 'zh-CN'],
+        ['en-US, en; q=0.5, zh; q=0.5', 'en-US'],
+        ['en;q=0.8,zh;q=0.8', 'en-US'],
+        ['de-DE,de;q=0.9,en;q=0.8', 'en-US'],
+        ['es-419,en', 'en-US'],
+        ['zh;q=0,en;q=0.1', 'en-US'],
+    ),
+)
+def test_parse_accept_language(accept_language: str, expected: str) -> None:
+    assert _parse_accept_language(accept_language) == expected
+
+
+@pytest.mark.parametrize('accept_language', ['*', 'de-DE', 'es-419', 'de-DE,fr;q=0.9', 'zh;q=0'])
+def test_parse_accept_language_without_loaded_locale(accept_language: str) -> None:
+    assert _parse_accept_language(accept_language) is None
+
+
+def test_parse_accept_language_picks_up_later_loaded_locale(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert _parse_accept_language('de-DE,en;q=0.8') == 'en-US'
+    monkeypatch.setitem(i18n.locales, 'de-de', {})
+    assert _parse_accept_language('de-DE,en;q=0.8') == 'de-de'
+
+
+def test_language_is_reset_after_request() -> None:
+    language = next(lang for lang in i18n.locales if lang != settings.I18N_DEFAULT_LANGUAGE)
+    scope = {'type': 'http', 'headers': [(b'accept-language', language.encode())]}
+    seen = []
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        seen.append(current_language_context.get())
+
+    async def failing_app(scope: Scope, receive: Receive, send: Send) -> None:
+        seen.append(current_language_context.get())
+        raise RuntimeError
+
+    async def run() -> None:
+        # 同一任务内连续处理请求，未还原时语言会残留在当前上下文中
+        await I18nMiddleware(app)(scope, None, None)
+        assert current_language_context.get() == settings.I18N_DEFAULT_LANGUAGE
+
+        with pytest.raises(RuntimeError):
+            await I18nMiddleware(failing_app)(scope, None, None)
+        assert current_language_context.get() == settings.I18N_DEFAULT_LANGUAGE
+
+    asyncio.run(run())
+    assert seen == [language, language]